@@ -9,14 +9,212 @@ It uses the OpenAI Agents SDK for enhanced content generation.
 
 import os
 import csv
+import gzip
 import json
 import random
-from dotenv import load_dotenv
-from agents import Agent, Runner
-from typing import List, Dict, Tuple, Optional
+import string
+import asyncio
+import hashlib
+import functools
+import math
+import re
+import httpx
+from pathlib import Path
+from openai import AsyncOpenAI
+from agents import Agent, ModelSettings, OpenAIProvider, RunConfig, Runner
+from typing import AsyncIterator, List, Dict, Literal, NamedTuple, Protocol, Tuple, Optional, Union
+
+try:
+    from tqdm import tqdm
+except ImportError:  # Progress falls back to plain status lines
+    tqdm = None
+
+def find_env_file(filename: str = ".env") -> Optional[Path]:
+    """
+    Find a .env file in this script's directory or the nearest parent directory.
+    
+    Args:
+        filename: Name of the file to look for
+        
+    Returns:
+        Path to the file, or None if none was found
+    """
+    directory = Path(__file__).resolve().parent
+    for candidate in (directory, *directory.parents):
+        env_path = candidate / filename
+        if env_path.is_file():
+            return env_path
+    return None
+
+def load_env_file(path: Optional[str] = None):
+    """
+    Load KEY=VALUE pairs from a .env file into the environment.
+    
+    Variables already set in the environment take precedence, and the file is
+    only read when the API key isn't already configured.
+    
+    Args:
+        path: Path to the .env file (defaults to the nearest one found by find_env_file)
+    """
+    if os.environ.get("OPENAI_API_KEY"):
+        return
+    env_path = Path(path) if path else find_env_file()
+    if env_path is None or not env_path.exists():
+        return
+    
+    for line in env_path.read_text(encoding='utf-8').splitlines():
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        key = key.strip()
+        if key.startswith('export '):
+            key = key[len('export '):].strip()
+        value = value.strip()
+        if value[:1] in ('"', "'") and value.find(value[0], 1) != -1:
+            # Quoted values keep everything up to the closing quote
+            value = value[1:value.find(value[0], 1)]
+        else:
+            # Unquoted values end at an inline comment
+            value = re.split(r'\s+#', value, maxsplit=1)[0]
+        os.environ.setdefault(key, value)
 
 # Load environment variables
-load_dotenv()
+load_env_file()
+
+class SeedParams(NamedTuple):
+    """Parameters guiding the generation of a single prompt."""
+    category: str
+    technology_level: str
+    setting: str
+    tone: str
+    focus: str
+
+# Output token cap, with room for one 50-75 word paragraph
+MAX_PROMPT_TOKENS = 150
+
+# Instructions shared by every model backend
+AGENT_INSTRUCTIONS = """
+You are a creative futurist writing digital-art prompts about how technology, AI,
+and biological beings coexist in 2077. For the given parameters:
+- Build on 2077 baseline tech (neural implants, quantum AI, bioengineering, climate control,
+  space colonies) and add one specific technological or social innovation
+- Show nuanced AI/tech/biology integration, benefits and challenges alike
+- Ground the scene in vivid visuals plus one unexpected taste, smell, texture, temperature, or pressure
+- Show characters physically adapting to or resisting technology
+- Use authentic cultural detail and culturally distinct solutions or conflicts
+- Allow cyberpunk tension (corporate power, decay, resistance) without clichés
+- Vary syntax, perspective, tone, and vocabulary
+- End with a complete scene resolution
+- Place "Relegoai" as small readable text on equipment, displays, or structures in the bottom right
+
+Reply with a single 50-75 word paragraph and no prefacing text.
+"""
+
+class PromptBackend(Protocol):
+    """A model backend that turns a prompt query into generated prompt text."""
+    
+    async def complete(self, query: str) -> str:
+        """Return the generated prompt text for a query."""
+        ...
+    
+    async def aclose(self):
+        """Release any connections held by the backend."""
+        ...
+
+class OpenAIAgentBackend:
+    """Generates prompts with GPT-4.1 mini through the OpenAI Agents SDK."""
+    
+    def __init__(self, concurrency: int = 32):
+        """
+        Initialize the agent; its HTTP client is opened on first use.
+        
+        Args:
+            concurrency: Maximum number of pooled connections
+        """
+        self.concurrency = concurrency
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[AsyncOpenAI] = None
+        self._run_config: Optional[RunConfig] = None
+        
+        # Initialize the agent with specialized instructions and GPT-4.1 mini model
+        self.agent = Agent(
+            name="FutureVisionAgent",
+            model="gpt-4.1-mini",  # Explicitly use GPT-4.1 mini
+            model_settings=ModelSettings(max_tokens=MAX_PROMPT_TOKENS),
+            instructions=AGENT_INSTRUCTIONS
+        )
+    
+    @property
+    def client(self) -> AsyncOpenAI:
+        """OpenAI client for this backend, reopened if it was closed."""
+        self._ensure_open()
+        return self._client
+    
+    def _ensure_open(self):
+        """Open the HTTP client and the run config bound to it, if not already open."""
+        if self._client is None:
+            # Share one pooled HTTP client across all agent runs so concurrent
+            # requests reuse keep-alive connections instead of re-handshaking
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+                ),
+                timeout=60
+            )
+            self._client = AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"], http_client=self._http_client)
+            
+            # Bound to this backend's runs only, not the SDK's process-wide default
+            self._run_config = RunConfig(model_provider=OpenAIProvider(openai_client=self._client))
+    
+    async def complete(self, query: str) -> str:
+        """Run the agent on a query and return its output."""
+        self._ensure_open()
+        result = await Runner.run(self.agent, query, run_config=self._run_config)
+        return result.final_output.strip()
+    
+    async def aclose(self):
+        """Close the shared HTTP client; it is reopened on next use."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._client = None
+        self._run_config = None
+
+class OllamaBackend:
+    """Generates prompts with a model served by a local Ollama server."""
+    
+    def __init__(self, model: str = "llama3", url: str = "http://localhost:11434/api/generate"):
+        """
+        Initialize the backend; its HTTP client is opened on first use.
+        
+        Args:
+            model: Name of the Ollama model to use
+            url: Ollama generate endpoint
+        """
+        self.model = model
+        self.url = url
+        self._http_client: Optional[httpx.AsyncClient] = None
+    
+    async def complete(self, query: str) -> str:
+        """Send a query to the Ollama server and return its response."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=120)
+        response = await self._http_client.post(self.url, json={
+            "model": self.model,
+            "system": AGENT_INSTRUCTIONS,
+            "prompt": query,
+            "stream": False,
+            "options": {"num_predict": MAX_PROMPT_TOKENS}
+        })
+        response.raise_for_status()
+        return response.json()["response"].strip()
+    
+    async def aclose(self):
+        """Close the HTTP client; it is reopened on next use."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._http_client = None
 
 class FutureVisionGenerator:
     """
@@ -24,13 +222,23 @@ class FutureVisionGenerator:
     technology, AI, and biological beings coexist.
     """
     
-    def __init__(self, output_file: str, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        output_file: str,
+        api_key: Optional[str] = None,
+        concurrency: int = 32,
+        seed: Optional[int] = None,
+        backend: Literal["openai", "ollama"] = "openai"
+    ):
         """
         Initialize the generator with output file path and optional API key.
         
         Args:
             output_file: Path to save the CSV output
             api_key: OpenAI API key (optional if already in environment)
+            concurrency: Maximum number of in-flight API requests
+            seed: Seed for the parameter RNG, for reproducible parameter sequences
+            backend: Model backend, either the OpenAI Agents SDK or a local Ollama server
         """
         self.output_file = output_file
         
@@ -38,96 +246,399 @@ class FutureVisionGenerator:
         if api_key:
             os.environ["OPENAI_API_KEY"] = api_key
         
+        if backend not in ("openai", "ollama"):
+            raise ValueError(f"Unknown backend '{backend}'. Use 'openai' or 'ollama'.")
+        
         # Verify API key exists
-        if not os.environ.get("OPENAI_API_KEY"):
+        if backend == "openai" and not os.environ.get("OPENAI_API_KEY"):
             raise ValueError("No OpenAI API key found. Please provide one or set OPENAI_API_KEY in the .env file.")
+        
+        # Bound the number of concurrent API calls; a local Ollama server
+        # queues requests rather than running them in parallel
+        if backend == "ollama":
+            concurrency = min(concurrency, 4)
+        self._concurrency = concurrency
+        
+        # Created lazily in the running loop; before Python 3.10 a semaphore
+        # binds to the loop current at construction, which main() hasn't started yet
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._sem_loop: Optional[asyncio.AbstractEventLoop] = None
             
         # Initialize categories for diverse prompt generation
-        self.categories = [
+        self.categories = (
             "Human-AI Integration", "Space Exploration", "Urban Development",
             "Biotechnology", "Communication", "Transportation", "Entertainment",
             "Environment", "Governance", "Work & Economy", "Education", "Healthcare",
             "Food Systems", "Art & Creativity", "Home & Living", "Social Structures",
             "Mars Colonization", "Neural Interfaces", "Quantum Computing", "Consciousness Transfer",
             "Ocean Colonization", "Genetic Engineering", "Climate Engineering", "Interstellar Travel"
-        ]
+        )
         
-        # Initialize the agent with specialized instructions and GPT-4.1 mini model
-        self.agent = Agent(
-            name="FutureVisionAgent",
-            model="gpt-4.1-mini",  # Explicitly use GPT-4.1 mini
-            instructions="""
-            You are a creative futurist specializing in generating highly diverse, imaginative prompts 
-            about how technology, AI, and biological beings might coexist 100 years from now.
-            
-            When given a category and parameters, create a highly detailed, evocative prompt that:
-            1. Presents a realistic extrapolation of current technology trends with specific innovations
-            2. Depicts nuanced integration between AI systems, technology, and biological entities
-            3. Balances utopian and practical elements, showing both benefits and challenges
-            4. Uses rich, varied sensory details and specific, non-repetitive terminology
-            5. Creates a clear visual scene with distinct aesthetic styles beyond cyberpunk clichés
-            6. Considers unexpected societal, ethical, environmental, or philosophical implications
-            7. Varies syntax, perspective, and tone to prevent formulaic structures
-            8. Diversifies settings across multiple environments (not just orbital/space)
-            9. Introduces culturally diverse perspectives on future technology integration
-            10. Incorporates a unique technological or social innovation in each prompt
-            11. Include cyberpunk elements: corporate power structures, urban decay contrasted with high-tech, or underground resistance movements
-            12. Assume 2077 baseline technologies: neural implants, quantum AI, bioengineered organisms, climate manipulation, space colonization
-            13. Vary emotional tones from hopeful to cautionary, mysterious to mundane
-            14. Ensure each prompt ends with a complete thought and scene resolution
-            15. Verify no repeated phrases across consecutive prompts in a batch
-            16. Include at least one unexpected sensory detail (taste, smell, texture, temperature, or pressure) that grounds the reader
-            17. Add subtle physical interactions between characters and technology that show adaptation or resistance
-            18. When referencing specific cultures, include authentic details (architectural elements, social structures, spiritual practices) rather than surface aesthetics
-            19. Show how different cultural approaches to technology create distinct solutions or conflicts
-            20. Naturally integrate "Relegoai" as small, readable text within the scene's environment (on equipment, displays, or structures) positioned in the bottom right of the composition
-            
-            
-            IMPORTANT: Avoid repetitive vocabulary such as "bioluminescent," "translucent," "seamlessly," 
-            "orbital," etc. Expand your linguistic palette for each new prompt. Vary sentence structures
-            and prompt formats to prevent formulaic patterns like "In a [location], [bio-tech elements]
-            collaborate with [AI/humans] while [atmospheric details]".
-            
-            Format your response as a single paragraph (50-75 words) with no prefacing text.
-            """
+        # Remaining seed dimensions
+        self.technology_levels = ("early-stage", "mature", "post-singularity")
+        self.settings = ("urban", "low-orbit station", "underwater", "martian", "wilderness", "space")
+        self.tones = ("optimistic", "pragmatic", "complex", "contemplative")
+        self.focuses = ("daily life", "work", "art", "governance", "exploration", "communication")
+        
+        # In-flight requests keyed by seed parameters, for request coalescing
+        self._inflight: Dict[SeedParams, asyncio.Future] = {}
+        
+        # Overused vocabulary is filtered after generation rather than policed by
+        # the model; rejected prompts are regenerated, or rewritten with these
+        # replacements once the retry budget is spent
+        self._banned_synonyms = {
+            "bioluminescent": "glowing",
+            "translucent": "gauzy",
+            "seamlessly": "fluidly",
+            "orbital": "orbiting",
+        }
+        self._banned = re.compile(
+            r"\b(" + "|".join(self._banned_synonyms) + r")\b", re.IGNORECASE
         )
-
-    def generate_seed_parameters(self) -> Dict:
+        
+        # Dedicated RNG so concurrent tasks don't share the module-level generator,
+        # optionally seeded so runs draw the same parameter sequence
+        self._rng = random.Random(seed)
+        
+        # Constant query scaffolding; only the seed parameters vary per call
+        self._query_tpl = string.Template("""
+        Create a detailed, imaginative prompt for digital art depicting futuristic coexistence 
+        between technology, AI, and beings 100 years from now.
+        
+        Category: $category
+        Technology Level: $technology_level
+        Setting: $setting
+        Tone: $tone
+        Focus: $focus
+        
+        Make it specific, visual, and evocative. The prompt should be a rich description that
+        could be used to generate digital art.
+        """)
+        
+        # Initialize the backend that turns queries into prompts
+        if backend == "ollama":
+            self._backend: PromptBackend = OllamaBackend()
+        else:
+            self._backend = OpenAIAgentBackend(concurrency)
+        
+    def generate_seed_parameters(self) -> SeedParams:
         """Generate random seed parameters for a prompt."""
-        return {
-            "category": random.choice(self.categories),
-            "technology_level": random.choice(["early-stage", "mature", "post-singularity"]),
-            "setting": random.choice(["urban", "orbital", "underwater", "martian", "wilderness", "space"]),
-            "tone": random.choice(["optimistic", "pragmatic", "complex", "contemplative"]),
-            "focus": random.choice(["daily life", "work", "art", "governance", "exploration", "communication"])
-        }
+        return SeedParams(
+            category=self._rng.choice(self.categories),
+            technology_level=self._rng.choice(self.technology_levels),
+            setting=self._rng.choice(self.settings),
+            tone=self._rng.choice(self.tones),
+            focus=self._rng.choice(self.focuses)
+        )
+
+    def generate_seed_parameters_batch(self, n: int) -> List[SeedParams]:
+        """
+        Generate random seed parameters for many prompts at once.
+        
+        Args:
+            n: Number of parameter sets to generate
+            
+        Returns:
+            List of seed parameters
+        """
+        return list(map(
+            SeedParams,
+            self._rng.choices(self.categories, k=n),
+            self._rng.choices(self.technology_levels, k=n),
+            self._rng.choices(self.settings, k=n),
+            self._rng.choices(self.tones, k=n),
+            self._rng.choices(self.focuses, k=n)
+        ))
 
-    async def generate_prompt(self, params: Dict) -> str:
+    async def generate_prompt(self, params: Union[SeedParams, Dict]) -> str:
         """
         Generate a single prompt using the AI agent.
         
+        Concurrent calls with identical parameters share one API request.
+        
         Args:
-            params: Dictionary of parameters to guide prompt generation
+            params: Seed parameters (or an equivalent dictionary) to guide prompt generation
             
         Returns:
             Generated prompt text
         """
-        prompt_query = f"""
-        Create a detailed, imaginative prompt for digital art depicting futuristic coexistence 
-        between technology, AI, and beings 100 years from now.
+        if isinstance(params, dict):
+            params = SeedParams(**params)
         
-        Category: {params['category']}
-        Technology Level: {params['technology_level']}
-        Setting: {params['setting']}
-        Tone: {params['tone']}
-        Focus: {params['focus']}
+        inflight = self._inflight.get(params)
+        if inflight is not None:
+            # Shielded so a cancelled follower doesn't cancel the shared request
+            return await asyncio.shield(inflight)
         
-        Make it specific, visual, and evocative. The prompt should be a rich description that
-        could be used to generate digital art.
+        request = asyncio.ensure_future(self._request_prompt(params))
+        self._inflight[params] = request
+        request.add_done_callback(lambda _: self._inflight.pop(params, None))
+        return await request
+
+    async def _request_prompt(self, params: SeedParams) -> str:
+        """Send a single prompt request to the AI agent."""
+        prompt_query = self._query_tpl.substitute(params._asdict())
+        
+        async with self._semaphore():
+            return await self._backend.complete(prompt_query)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self._concurrency)
+            self._sem_loop = loop
+        return self._sem
+
+    @staticmethod
+    def _digest(prompt: str) -> bytes:
         """
+        Return a compact fingerprint of a prompt for duplicate detection.
         
-        result = await Runner.run(self.agent, prompt_query)
-        return result.final_output.strip()
+        Case and whitespace are normalized first so prompts differing only
+        in formatting are treated as duplicates.
+        """
+        normalized = " ".join(prompt.lower().split())
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+    def _replace_banned(self, prompt: str) -> str:
+        """Swap overused vocabulary in a prompt for its fixed replacement."""
+        def substitute(match):
+            word = match.group(0)
+            replacement = self._banned_synonyms[word.lower()]
+            return replacement.capitalize() if word[0].isupper() else replacement
+        
+        return self._banned.sub(substitute, prompt)
+
+    async def _report_progress(self, interval: float = 0.5):
+        """
+        Periodically report batch progress until cancelled.
+        
+        Args:
+            interval: Seconds between progress samples
+        """
+        bar = tqdm(total=self._total, initial=self._done, unit="prompt") if tqdm else None
+        reported = self._done
+        
+        def report():
+            nonlocal reported
+            if self._done == reported:
+                return
+            if bar is not None:
+                bar.update(self._done - reported)
+            else:
+                print(f"Progress: {self._done}/{self._total} prompts generated")
+            reported = self._done
+        
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                report()
+        finally:
+            report()
+            if bar is not None:
+                bar.close()
+
+    async def _iter_prompts(
+        self, count: int, existing: Optional[Dict[int, str]] = None
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Yield unique prompts as soon as their API calls complete.
+        
+        Args:
+            count: Number of prompts to generate
+            existing: Prompts already saved by an earlier run, keyed by ID;
+                their IDs are skipped and their text counts towards uniqueness
+            
+        Yields:
+            (id, prompt) tuples in completion order
+        """
+        existing = existing or {}
+        ids = [i for i in range(1, count + 1) if i not in existing]
+        seen_digests: set[bytes] = {self._digest(p) for p in existing.values()}  # Track unique content
+        generated = 0
+        
+        # Banned-word rejections up to the overprovisioned headroom are regenerated
+        retry_budget = math.ceil(len(ids) * 0.05)
+        
+        # Progress is reported by a background ticker, off the completion path
+        self._done = count - len(ids)
+        self._total = count
+        ticker = asyncio.create_task(self._report_progress())
+        
+        try:
+            pending = len(ids)
+            while pending:
+                accepted = 0
+                last_error = None
+                
+                # Launch a few extra requests up front so rare duplicates or failures
+                # are absorbed by the same pass instead of a follow-up round trip
+                tasks = [
+                    asyncio.create_task(self.generate_prompt(params))
+                    for params in self.generate_seed_parameters_batch(math.ceil(pending * 1.05))
+                ]
+                
+                try:
+                    for future in asyncio.as_completed(tasks):
+                        try:
+                            prompt = await future
+                        except Exception as e:
+                            last_error = e
+                            continue
+                        
+                        # An empty response is never a usable prompt
+                        if not prompt:
+                            continue
+                        
+                        # Reject overused vocabulary while the retry budget lasts
+                        if self._banned.search(prompt):
+                            if retry_budget:
+                                retry_budget -= 1
+                                continue
+                            prompt = self._replace_banned(prompt)
+                        
+                        # Ensure uniqueness
+                        digest = self._digest(prompt)
+                        if digest in seen_digests:
+                            continue
+                        
+                        seen_digests.add(digest)
+                        accepted += 1
+                        yield ids[generated], prompt
+                        generated += 1
+                        self._done += 1
+                        
+                        if generated == len(ids):
+                            break
+                finally:
+                    # Extra requests are no longer needed once the target is reached
+                    for task in tasks:
+                        task.cancel()
+                
+                # Give up if a whole pass failed rather than retrying forever
+                if not accepted and last_error is not None:
+                    raise last_error
+                
+                # Only top up with another pass if the batch came up short
+                pending = len(ids) - generated
+        finally:
+            ticker.cancel()
+            await asyncio.gather(ticker, return_exceptions=True)
+
+    async def _iter_batch_prompts(
+        self, count: int, existing: Optional[Dict[int, str]] = None, poll_interval: float = 30.0
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Yield unique prompts produced by a single OpenAI Batch API job.
+        
+        Any shortfall after duplicates and failed requests is topped up
+        through the interactive path.
+        
+        Args:
+            count: Number of prompts to generate
+            existing: Prompts already saved by an earlier run, keyed by ID
+            poll_interval: Seconds between batch status checks
+            
+        Yields:
+            (id, prompt) tuples
+        """
+        if not isinstance(self._backend, OpenAIAgentBackend):
+            raise ValueError("Batch generation requires the 'openai' backend.")
+        
+        existing = dict(existing or {})
+        ids = [i for i in range(1, count + 1) if i not in existing]
+        if not ids:
+            return
+        
+        client = self._backend.client
+        
+        # The batch id is kept next to the output file so an interrupted run
+        # reattaches to the job it already paid for instead of submitting another
+        batch_id_file = Path(self.output_file + '.batch')
+        batch = None
+        if batch_id_file.exists():
+            batch = await client.batches.retrieve(batch_id_file.read_text(encoding='utf-8').strip())
+            if batch.status in ("failed", "cancelled") or (batch.status == "expired" and not batch.output_file_id):
+                print(f"Previous batch {batch.id} ended with status '{batch.status}'; submitting a new one...")
+                batch = None
+            else:
+                print(f"Resuming batch {batch.id}; checking status every {poll_interval:g}s...")
+        
+        if batch is None:
+            # One chat-completion request per seed, with the same headroom as interactive passes
+            requests = "\n".join(
+                json.dumps({
+                    "custom_id": f"prompt-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self._backend.agent.model,
+                        "messages": [
+                            {"role": "system", "content": AGENT_INSTRUCTIONS},
+                            {"role": "user", "content": self._query_tpl.substitute(params._asdict())}
+                        ],
+                        "max_tokens": MAX_PROMPT_TOKENS
+                    }
+                })
+                for i, params in enumerate(self.generate_seed_parameters_batch(math.ceil(len(ids) * 1.05)))
+            )
+            
+            batch_file = await client.files.create(
+                file=("future_vision_batch.jsonl", requests.encode('utf-8')), purpose="batch"
+            )
+            batch = await client.batches.create(
+                input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+            )
+            batch_id_file.write_text(batch.id, encoding='utf-8')
+            print(f"Submitted batch {batch.id}; checking status every {poll_interval:g}s...")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+            if batch.request_counts:
+                print(f"Batch {batch.status}: {batch.request_counts.completed}/{batch.request_counts.total} requests done")
+        
+        # Expired batches still return whatever completed before the deadline
+        if not batch.output_file_id:
+            batch_id_file.unlink(missing_ok=True)
+            raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}' and no output.")
+        output = await client.files.content(batch.output_file_id)
+        
+        seen_digests: set[bytes] = {self._digest(p) for p in existing.values()}
+        generated = 0
+        for line in output.text.splitlines():
+            if generated == len(ids):
+                break
+            response = json.loads(line).get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            
+            # Refusals come back with no content, and completions cut off at the
+            # token cap lack a scene resolution; the interactive top-up replaces both
+            choices = response.get("body", {}).get("choices") or [{}]
+            content = (choices[0].get("message") or {}).get("content")
+            if not content or choices[0].get("finish_reason") == "length":
+                continue
+            
+            # No cheap retries here, so overused vocabulary is rewritten directly
+            prompt = self._replace_banned(content.strip())
+            digest = self._digest(prompt)
+            if not prompt or digest in seen_digests:
+                continue
+            
+            seen_digests.add(digest)
+            existing[ids[generated]] = prompt
+            yield ids[generated], prompt
+            generated += 1
+        
+        # Every usable result has been handed out; a re-run needs a new batch
+        batch_id_file.unlink(missing_ok=True)
+        
+        if generated < len(ids):
+            print(f"Batch returned {generated}/{len(ids)} usable prompts; generating the rest interactively...")
+            async for row in self._iter_prompts(count, existing):
+                yield row
 
     async def generate_batch(self, count: int = 300) -> List[Tuple[int, str]]:
         """
@@ -139,63 +650,258 @@ class FutureVisionGenerator:
         Returns:
             List of (id, prompt) tuples
         """
-        prompts = []
-        generated_content = set()  # Track unique content
-        
         print(f"Generating {count} unique futuristic prompts...")
+        return [row async for row in self._iter_prompts(count)]
+
+    async def aclose(self):
+        """Close the backend and its pooled connections."""
+        await self._backend.aclose()
+
+    @staticmethod
+    def _format_row(prompt_id, prompt: str) -> str:
+        """Format an (id, prompt) row exactly as csv.writer with QUOTE_ALL would."""
+        escaped = prompt.replace('"', '""')
+        return f'"{prompt_id}","{escaped}"\r\n'
+
+    def _write_rows(self, csvfile, rows: List[Tuple], safe_csv: bool = False):
+        """
+        Append rows to the output file and sync them to disk.
         
-        for i in range(1, count + 1):
-            params = self.generate_seed_parameters()
-            prompt = await self.generate_prompt(params)
-            
-            # Ensure uniqueness
-            while prompt in generated_content:
-                params = self.generate_seed_parameters()
-                prompt = await self.generate_prompt(params)
-            
-            generated_content.add(prompt)
-            prompts.append((i, prompt))
+        Args:
+            csvfile: Open output file
+            rows: (id, prompt) tuples to write
+            safe_csv: Write rows through csv.writer instead of the direct formatter
+        """
+        if safe_csv:
+            csv.writer(csvfile, quoting=csv.QUOTE_ALL).writerows(rows)
+        else:
+            # Two fixed columns only need quote escaping
+            csvfile.write("".join(self._format_row(*row) for row in rows))
+        csvfile.flush()
+        os.fsync(csvfile.fileno())
+
+    async def _write_queued_rows(self, csvfile, queue: asyncio.Queue, safe_csv: bool = False):
+        """
+        Write rows from a queue to the output file in a worker thread.
+        
+        Rows that are already waiting are written together, up to 16 per
+        chunk, until a None sentinel is received.
+        
+        Args:
+            csvfile: Open output file
+            queue: Queue of (id, prompt) tuples, terminated by None
+            safe_csv: Write rows through csv.writer instead of the direct formatter
+        """
+        try:
+            finished = False
+            while not finished:
+                rows = [await queue.get()]
+                while len(rows) < 16 and not queue.empty():
+                    rows.append(queue.get_nowait())
+                if rows[-1] is None:
+                    rows.pop()
+                    finished = True
+                if rows:
+                    await asyncio.to_thread(self._write_rows, csvfile, rows, safe_csv)
+        except BaseException:
+            # Unblock any producer waiting on a full queue
+            while not queue.empty():
+                queue.get_nowait()
+            raise
+
+    def _open_output(self, mode: str, path: Optional[str] = None):
+        """
+        Open the output file as text, gzip-compressed when its name ends in .gz.
+        
+        Args:
+            mode: 'r', 'w', or 'a'
+            path: File to open (defaults to the output file)
             
-            if i % 10 == 0:
-                print(f"Progress: {i}/{count} prompts generated")
+        Returns:
+            Open text file object
+        """
+        path = path or self.output_file
+        if path.endswith('.gz'):
+            return gzip.open(path, mode + 't', compresslevel=6, encoding='utf-8', newline='')
+        return open(path, mode, newline='', encoding='utf-8', buffering=1 << 20)
+
+    def _load_checkpoint(self) -> Dict[int, str]:
+        """
+        Read prompts saved to the output file by an interrupted earlier run.
+        
+        A trailing row cut off mid-write is removed from the file so new
+        rows can be appended cleanly.
+        
+        Returns:
+            Saved prompts keyed by ID
+        """
+        existing = {}
+        if not os.path.exists(self.output_file):
+            return existing
+        
+        offset = 0
+        valid_end = 0
+        last_line = ''
+        damaged = False
+        
+        try:
+            with self._open_output('r') as csvfile:
+                def tracked_lines():
+                    nonlocal offset, last_line
+                    for line in csvfile:
+                        offset += len(line.encode('utf-8'))
+                        last_line = line
+                        yield line
                 
-        return prompts
+                for row in csv.reader(tracked_lines(), strict=True):
+                    # A row cut off before its line terminator would have the
+                    # next append glued onto it
+                    if not last_line.endswith('\n'):
+                        damaged = True
+                        break
+                    if row == ['ID', 'Prompt']:
+                        valid_end = offset
+                        continue
+                    if len(row) != 2 or not row[0].isdigit():
+                        damaged = True
+                        break
+                    existing[int(row[0])] = row[1]
+                    valid_end = offset
+        except gzip.BadGzipFile as e:
+            # Garbage after valid gzip data is damage; a file that was never
+            # gzip at all holds someone's data and must not be overwritten
+            if not valid_end:
+                raise gzip.BadGzipFile(
+                    f"{self.output_file} is not a gzip file; rename it or use an output path without .gz"
+                ) from e
+            damaged = True
+        except (csv.Error, EOFError, UnicodeDecodeError):
+            damaged = True
+        
+        if self.output_file.endswith('.gz'):
+            # Compressed offsets can't be truncated, so rewrite the valid rows
+            if damaged:
+                repaired = self.output_file[:-len('.gz')] + '.tmp.gz'
+                with self._open_output('w', repaired) as csvfile:
+                    self._write_rows(csvfile, [('ID', 'Prompt'), *sorted(existing.items())])
+                os.replace(repaired, self.output_file)
+        elif valid_end < os.path.getsize(self.output_file):
+            os.truncate(self.output_file, valid_end)
+        
+        return existing
 
-    async def generate_and_save(self, count: int = 300):
+    async def _save_prompts(self, iter_prompts, count: int, safe_csv: bool = False):
         """
-        Generate prompts and save them to a CSV file.
+        Stream prompts from a generator into the output file as they complete.
+        
+        Output is gzip-compressed when the file name ends in .gz. Rows are
+        synced to disk in small chunks, and prompts already present in the
+        output file from an interrupted run are kept and not regenerated.
         
         Args:
+            iter_prompts: Async generator method taking (count, existing) and
+                yielding (id, prompt) tuples
             count: Number of prompts to generate
+            safe_csv: Write rows through csv.writer instead of the direct formatter
         """
-        prompts = await self.generate_batch(count)
+        existing = self._load_checkpoint()
+        if existing:
+            print(f"Resuming: {len(existing)} prompts already saved to {self.output_file}")
+        
+        print(f"Generating {count} unique futuristic prompts...")
         
-        with open(self.output_file, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile, quoting=csv.QUOTE_ALL)
-            writer.writerow(['ID', 'Prompt'])
-            writer.writerows(prompts)
+        # Compressed files are appended as new gzip members, so check the header
+        # against the file on disk rather than the stream position
+        write_header = not os.path.exists(self.output_file) or os.path.getsize(self.output_file) == 0
+        
+        written = 0
+        try:
+            with self._open_output('a') as csvfile:
+                if write_header:
+                    self._write_rows(csvfile, [('ID', 'Prompt')], safe_csv)
+                
+                # Rows are handed to a writer task so disk I/O never blocks the event loop
+                queue: asyncio.Queue = asyncio.Queue(maxsize=128)
+                writer = asyncio.create_task(self._write_queued_rows(csvfile, queue, safe_csv))
+                prompts = iter_prompts(count, existing)
+                try:
+                    async for row in prompts:
+                        if writer.done():
+                            break
+                        await queue.put(row)
+                        written += 1
+                finally:
+                    # Stop in-flight requests and the progress ticker before the
+                    # backend's HTTP client is closed
+                    await prompts.aclose()
+                    if not writer.done():
+                        await queue.put(None)
+                    await writer
+        finally:
+            await self.aclose()
             
-        print(f"Successfully generated {len(prompts)} unique futuristic prompts!")
+        print(f"Successfully generated {written} unique futuristic prompts!")
         print(f"Saved to: {self.output_file}")
         
+    async def generate_and_save(self, count: int = 300, safe_csv: bool = False):
+        """
+        Generate prompts interactively and stream them to a CSV file as they complete.
+        
+        Args:
+            count: Number of prompts to generate
+            safe_csv: Write rows through csv.writer instead of the direct formatter
+        """
+        await self._save_prompts(self._iter_prompts, count, safe_csv)
+
+    async def generate_and_save_batch(
+        self, count: int = 300, safe_csv: bool = False, poll_interval: float = 30.0
+    ):
+        """
+        Generate prompts through the OpenAI Batch API and save them to a CSV file.
+        
+        Batch requests are billed at a lower rate but may take up to 24 hours.
+        Small runs (under 50 prompts) use the interactive path instead.
+        
+        Args:
+            count: Number of prompts to generate
+            safe_csv: Write rows through csv.writer instead of the direct formatter
+            poll_interval: Seconds between batch status checks
+        """
+        if count < 50:
+            await self.generate_and_save(count, safe_csv)
+            return
+        
+        iter_prompts = functools.partial(self._iter_batch_prompts, poll_interval=poll_interval)
+        await self._save_prompts(iter_prompts, count, safe_csv)
+
     # The offline generation methods have been removed as we're now exclusively using the online 
     # GPT-4.1 mini powered prompt generation through OpenAI Agents SDK
 
 def main():
     """Main execution function."""
-    import asyncio
-    import os
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate futuristic vision prompts.")
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="submit the run as a discounted OpenAI Batch API job (may take up to 24 hours)"
+    )
+    args = parser.parse_args()
     
     # Define output path - use current directory
-    output_path = os.path.join(os.getcwd(), "2077_future_vision.csv")
+    output_path = os.path.join(os.getcwd(), "2077_future_vision.csv.gz")
     
     try:
         # Create generator with the configured OpenAI API key
         generator = FutureVisionGenerator(output_path)
         
         # Run the prompt generation
-        print("Generating prompts using OpenAI Agents SDK with GPT-4.1 mini...")
-        asyncio.run(generator.generate_and_save())
+        if args.batch:
+            print("Generating prompts using the OpenAI Batch API with GPT-4.1 mini...")
+            asyncio.run(generator.generate_and_save_batch())
+        else:
+            print("Generating prompts using OpenAI Agents SDK with GPT-4.1 mini...")
+            asyncio.run(generator.generate_and_save())
             
     except ValueError as e:
         print(f"Configuration error: {e}")